@@ -4,6 +4,9 @@ quota limits.
 """
 
 import json
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
 
@@ -11,11 +14,14 @@ class FileCache:
     """A file-based cache that stores new information at the given file path in
     JSON format. If the file doesn't exist, or is corrupt JSON, a new file will
     be created in its place. To clear the cache, delete the file.
+
+    The cache can be safely shared between threads.
     """
 
     def __init__(self, file_path_str: str):
         self.file_path = Path(file_path_str)
         self.items = {}
+        self.lock = threading.Lock()
 
         try:
             with self.file_path.open("r") as file:
@@ -27,12 +33,17 @@ class FileCache:
         return self.items[key]
 
     def set(self, key: str, value: str):
-        self.items[key] = value
+        # Hold the lock while writing, so that concurrent writes can't modify
+        # the items mid-dump or interleave their output in the file.
+        with self.lock:
+            self.items[key] = value
 
-        with self.file_path.open("w") as file:
-            json.dump(self.items, file)
+            with self.file_path.open("w") as file:
+                json.dump(self.items, file)
 
-    def has(self, key: str) -> bool:
+    def has(self, key: str, max_age: int = None) -> bool:
+        # The file cache doesn't record when items were stored, so its items
+        # never expire, and `max_age` is ignored.
         return key in self.items
 
     def __getitem__(self, item):
@@ -43,3 +54,91 @@ class FileCache:
 
     def __contains__(self, item):
         return self.has(item)
+
+
+class SqliteCache:
+    """A cache backed by an SQLite database at the given file path. Each item is
+    stored in JSON format, along with the time it was stored, so that stale
+    items can be ignored. If the file doesn't exist, or isn't a valid database,
+    a new database will be created in its place. To clear the cache, delete the
+    file.
+
+    Unlike `FileCache`, storing an item only writes that item, so this cache
+    stays fast as it grows. The cache can be safely shared between threads.
+    """
+
+    def __init__(self, file_path_str: str):
+        self.file_path = Path(file_path_str)
+        self.lock = threading.Lock()
+
+        try:
+            self.connection = self.connect()
+        except sqlite3.OperationalError:
+            # The database is locked, or the file can't be opened; it may
+            # still be a perfectly good cache, so don't throw it away.
+            raise
+        except sqlite3.DatabaseError:
+            # The file exists but isn't a database, so replace it.
+            self.file_path.unlink()
+            self.connection = self.connect()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database file, creating the cache table if needed."""
+        connection = sqlite3.connect(self.file_path, check_same_thread=False)
+
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, json TEXT, stored_at INTEGER)"
+            )
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+
+        return connection
+
+    def get(self, key: str) -> str:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT json FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: str):
+        # Serialize before touching the database, so unserializable values
+        # raise a TypeError without leaving anything behind.
+        value_json = json.dumps(value)
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (key, json, stored_at) VALUES (?, ?, ?)",
+                (key, value_json, int(time.time())),
+            )
+
+    def has(self, key: str, max_age: int = None) -> bool:
+        """Return True if the cache contains the given key. If `max_age` is
+        given, items stored more than that many seconds ago are ignored."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return False
+
+        if max_age is not None and time.time() - row[0] > max_age:
+            return False
+
+        return True
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __setitem__(self, item, value):
+        return self.set(item, value)
+
+    def __contains__(self, item):
+        return self.has(item)
@@ -4,6 +4,8 @@ and `parse` methods."""
 
 import re
 import hashlib
+import threading
+from collections import defaultdict
 from datetime import datetime
 from datetime import timezone
 from urllib.parse import urlparse, parse_qs
@@ -14,14 +16,42 @@ from functions.url import is_youtube_url
 from functions.messages import err
 from classes.exceptions import FetchRequestError, FetchParseError, VideoUnavailableError
 
+# Maximum number of video ids that can be requested in a single YouTube Data API
+# request.
+MAX_VIDEO_IDS_PER_REQUEST = 50
+
 
 class YouTubeFetchService:
     """Fetch service for YouTube video data. Requires a YouTube Data API key."""
 
+    # YouTube videos can be renamed, or taken down, so cached data is refreshed
+    # after 30 days.
+    cache_max_age = 30 * 24 * 60 * 60
+
     def __init__(self, api_key: str, do_build_service: bool = True):
+        self.api_key = api_key
+
+        # The YouTube Data API service isn't thread-safe (its underlying HTTP
+        # connection can't be shared between threads), so each thread gets its
+        # own copy of the service.
+        self.thread_local = threading.local()
+
         # Create the YouTube Data API service.
         if do_build_service:
-            self.yt_service = build("youtube", "v3", developerKey=api_key)
+            self.build_service()
+
+    def build_service(self):
+        """Create the YouTube Data API service for the current thread."""
+        self.thread_local.yt_service = build("youtube", "v3", developerKey=self.api_key)
+
+    @property
+    def yt_service(self):
+        """The YouTube Data API service for the current thread. The service is
+        created the first time it's used on each thread."""
+        if not hasattr(self.thread_local, "yt_service"):
+            self.build_service()
+
+        return self.thread_local.yt_service
 
     def extract_video_id(self, url: str) -> str:
         """Given a YouTube video URL, extract the video id from it, or None if
@@ -88,7 +118,74 @@ class YouTubeFetchService:
                 f"Response from YouTube Data API does not contain any items"
             )
 
-        response_item = response["items"][0]
+        return self.get_response_item_data(response["items"][0])
+
+    def request_many(self, urls: list[str]) -> dict[str, dict]:
+        """Query the YouTube Data API for all of the given URLs in a single batch
+        HTTP request. Return a dictionary mapping each URL to its video data.
+
+        URLs for which no data was returned (eg. because the video is
+        unavailable, no video id could be determined from the URL, or the
+        response data for the video couldn't be read) are left out of the
+        dictionary; use `request` to find out what went wrong. A problem with
+        one URL doesn't affect the others.
+        """
+        urls_by_video_id = defaultdict(list)
+        for url in urls:
+            try:
+                video_id = self.extract_video_id(url)
+            except (KeyError, ValueError):
+                # eg. a "/watch" URL with no "v" parameter, or a malformed URL
+                continue
+            if video_id is None:
+                continue
+            urls_by_video_id[video_id].append(url)
+
+        # Each videos().list call can ask for up to 50 videos. All of the calls
+        # are then sent together in a single batch HTTP request.
+        responses = {}
+
+        def store_response(request_id, response, exception):
+            # A failed call only loses the videos it asked for; the rest of the
+            # batch is still usable.
+            if exception is None and response is not None:
+                responses[request_id] = response
+
+        batch = self.yt_service.new_batch_http_request(callback=store_response)
+
+        video_ids = list(urls_by_video_id)
+        for i in range(0, len(video_ids), MAX_VIDEO_IDS_PER_REQUEST):
+            video_ids_chunk = video_ids[i : i + MAX_VIDEO_IDS_PER_REQUEST]
+            batch.add(
+                self.yt_service.videos().list(
+                    part="status,snippet,contentDetails", id=",".join(video_ids_chunk)
+                ),
+                request_id=str(i),
+            )
+
+        try:
+            batch.execute()
+        except Exception as e:
+            raise FetchRequestError(
+                f"Could not request {len(video_ids)} videos via the YouTube Data API; error while executing batch request: {e}"
+            ) from e
+
+        videos_data = {}
+        for response in responses.values():
+            for response_item in response["items"]:
+                try:
+                    video_urls = urls_by_video_id.get(response_item["id"], [])
+                    for url in video_urls:
+                        videos_data[url] = self.get_response_item_data(response_item)
+                except (KeyError, ValueError):
+                    # Missing or malformed fields (eg. an unparseable duration)
+                    # only lose this video.
+                    continue
+
+        return videos_data
+
+    def get_response_item_data(self, response_item: dict) -> dict:
+        """Extract the video data from an item in a YouTube Data API response."""
         snippet = response_item["snippet"]
         iso8601_duration = response_item["contentDetails"]["duration"]
 
@@ -102,7 +199,13 @@ class YouTubeFetchService:
     def parse(self, video_data) -> dict:
         """Parse video data from a YouTube Data API response."""
 
-        upload_date = datetime.fromisoformat(video_data.get("upload_date"))
+        # The API gives UTC timestamps with a "Z" suffix, which
+        # `datetime.fromisoformat` only accepts from Python 3.11 onwards.
+        upload_date_str = video_data.get("upload_date")
+        if upload_date_str.endswith("Z"):
+            upload_date_str = upload_date_str[:-1] + "+00:00"
+
+        upload_date = datetime.fromisoformat(upload_date_str)
 
         return {
             "title": video_data.get("title"),
@@ -116,16 +219,62 @@ class YtDlpFetchService:
     """Fetch service which makes requests for video data via yt-dlp."""
 
     def __init__(self, accepted_domains: list[str]):
-        self.accepted_domains = accepted_domains
+        self.accepted_domains = frozenset(accepted_domains)
         self.ydl_opts = {
             "quiet": True,
         }
 
+        # Creating a YoutubeDL object is fairly expensive, so one is kept for
+        # reuse. It isn't thread-safe, so each thread gets its own. All of them
+        # are also tracked, so `close` can clean them up.
+        self.thread_local = threading.local()
+        self.ydls = []
+        self.ydls_lock = threading.Lock()
+
+    @property
+    def ydl(self) -> YoutubeDL:
+        """The YoutubeDL object for the current thread. The object is created
+        the first time it's used on each thread."""
+        if not hasattr(self.thread_local, "ydl"):
+            ydl = YoutubeDL(self.ydl_opts)
+            with self.ydls_lock:
+                self.ydls.append(ydl)
+            self.thread_local.ydl = ydl
+
+        return self.thread_local.ydl
+
+    def close(self):
+        """Close all of the YoutubeDL objects created by the service, which
+        saves their cookies and closes their HTTP sessions. This should be
+        called once the threads using the service have finished. If the
+        service is used again afterwards, new objects are created."""
+        with self.ydls_lock:
+            ydls = self.ydls
+            self.ydls = []
+            self.thread_local = threading.local()
+
+        for ydl in ydls:
+            ydl.close()
+
     def can_fetch(self, url: str) -> bool:
-        """Return True if the URL contains an accepted domain (other than
-        YouTube)."""
+        """Return True if the URL's host is an accepted domain (other than
+        YouTube), or a subdomain of one."""
 
-        return any(domain in url for domain in self.accepted_domains)
+        try:
+            hostname = urlparse(url).hostname
+        except ValueError:
+            # Malformed URL, eg. "https://[oops"
+            return False
+
+        if hostname is None:
+            return False
+
+        # Check the hostname and each of its parent domains, eg. for
+        # "www.tiktok.com", check "www.tiktok.com", "tiktok.com", and "com".
+        labels = hostname.split(".")
+        return any(
+            ".".join(labels[i:]) in self.accepted_domains for i in range(len(labels))
+        )
 
     def request(self, url: str):
         """Query yt-dlp for the given URL."""
@@ -138,35 +287,41 @@ class YtDlpFetchService:
             url = preprocess_changes.pop("url")
 
         try:
-            with YoutubeDL(self.ydl_opts) as ydl:
-                response = ydl.extract_info(url, download=False)
+            response = self.ydl.extract_info(url, download=False)
 
-                if "entries" in response:
-                    response = response["entries"][0]
+            if "entries" in response:
+                response = response["entries"][0]
 
         except Exception as e:
             raise FetchRequestError(
                 f'Could not fetch URL "{url}" via yt-dlp; error while extracting video info: {e}'
             ) from e
 
+        video_data = {
+            "title": response.get("title"),
+            "channel": response.get("channel"),
+            "upload_date": response.get("upload_date"),
+            "duration": response.get("duration"),
+        }
+
         # preprocess_changes contains the response key that should be assigned a new value,
         # and corrected, which can either be a different response key that has the value we
         # originally wanted, None if the response key has an incorrect value with no substitutes,
-        # or a lambda function that modifies the value assigned to the respose key
-        if len(preprocess_changes):
-            for response_key, corrected in preprocess_changes.items():
-                if corrected is None:
-                    response[response_key] = None
-                elif isinstance(corrected, str):
-                    response[response_key] = response.get(corrected)
-                else:
-                    response[response_key] = corrected(response)
+        # or a lambda function that modifies the value assigned to the respose key.
+        # The changes are applied to video_data, so the response itself is left untouched
+        for response_key, corrected in preprocess_changes.items():
+            if corrected is None:
+                video_data[response_key] = None
+            elif isinstance(corrected, str):
+                video_data[response_key] = response.get(corrected)
+            else:
+                video_data[response_key] = corrected(response)
 
         return {
-            "title": response.get("title"),
-            "uploader": response.get("channel"),
-            "upload_date": response.get("upload_date"),
-            "duration": response.get("duration"),
+            "title": video_data["title"],
+            "uploader": video_data["channel"],
+            "upload_date": video_data["upload_date"],
+            "duration": video_data["duration"],
         }
 
     def parse(self, video_data):
@@ -235,7 +390,8 @@ class YtDlpFetchService:
     # Some sites like X and Tiktok don't have a designated place to put a title for
     # posts so the 'titles' are hashed here to reduce the chance of similarity detection
     # between different posts by the same uploader. Larger hash substrings decrease this chance
+    # The hash doesn't need to be cryptographically strong, so a 3-byte BLAKE2b
+    # digest is used, which directly gives just enough hex characters
     def hash_str(self, string):
-        h = hashlib.sha256()
-        h.update(string.encode())
+        h = hashlib.blake2b(string.encode(), digest_size=3)
         return h.hexdigest()[:5]
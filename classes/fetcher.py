@@ -1,5 +1,7 @@
+from collections import defaultdict
 from classes.exceptions import UnsupportedHostError, FetchRequestError
 from functions.manual_input import resolve
+from functions.url import is_youtube_url, normalize_youtube_url
 
 
 class Fetcher:
@@ -7,10 +9,16 @@ class Fetcher:
     runtime. To configure the fetcher, use `add_service` to register
     `FetchService` objects; the fetcher will then use these to handle fetch
     requests.
+
+    Services may optionally define a `request_many` method, which requests data
+    for several URLs at once (see `prefetch`), a `cache_max_age` attribute,
+    which is the number of seconds their video data stays valid in the cache,
+    and a `close` method, which releases any resources they hold (see `close`).
     """
 
     def __init__(self, ensure_complete_data=False):
         self.services = {}
+        self.prefetched = {}
         self.cache = None
         self.printer = None
         self.ensure_complete_data = ensure_complete_data
@@ -68,7 +76,7 @@ class Fetcher:
         cache_key = self.generate_cache_key(service_name, url)
         cached_video_data = None
 
-        if self.cache is not None and self.cache.has(cache_key):
+        if self.is_cached(service, cache_key):
             cached_video_data = self.cache.get(cache_key)
             self.print(f"[cache]: Video data for {url} loaded from cache.", "suc")
 
@@ -82,14 +90,18 @@ class Fetcher:
                 self.save_to_cache(video_data, cache_key, url)
 
         else:
-            # Request phase: Use a capable service to request video data
-            # from the URL.
-            try:
-                self.print(f"[{service_name}]: Requesting data from {url}...")
-                video_data = service.request(url)
-            except Exception as e:
-                self.print(f"[{service_name}]: Request error: {e}", "err")
-                raise e
+            # Request phase: Use the video data prefetched for this service and
+            # URL if there is any, otherwise use a capable service to request
+            # video data from the URL.
+            if cache_key in self.prefetched:
+                video_data = self.prefetched[cache_key]
+            else:
+                try:
+                    self.print(f"[{service_name}]: Requesting data from {url}...")
+                    video_data = service.request(url)
+                except Exception as e:
+                    self.print(f"[{service_name}]: Request error: {e}", "err")
+                    raise e
 
             if self.ensure_complete_data and not self.is_complete_video_data(
                 video_data
@@ -108,6 +120,64 @@ class Fetcher:
 
         return parsed_video_data
 
+    def prefetch(self, urls: list[str]):
+        """Request video data in bulk for the given URLs, using the `request_many`
+        method of any services that define one. This is usually much faster
+        than requesting each URL individually. The prefetched data is then used
+        by `fetch`, in place of a request.
+
+        URLs which are already cached, or which have no capable service that
+        defines `request_many`, are skipped. If a URL can't be prefetched,
+        `fetch` will fall back to requesting it individually.
+        """
+
+        # Group the URLs by the service that would be used to fetch them.
+        urls_by_service_name = defaultdict(list)
+        for url in urls:
+            # Prefetching is only an optimization, so a URL that can't be
+            # handled here (eg. because it's malformed) is left to `fetch`.
+            try:
+                capable_services = self.get_capable_services(url)
+                if len(capable_services) == 0:
+                    continue
+
+                service_name = [name for name in capable_services][0]
+                service = capable_services[service_name]
+                if not hasattr(service, "request_many"):
+                    continue
+
+                cache_key = self.generate_cache_key(service_name, url)
+                if self.is_cached(service, cache_key):
+                    continue
+            except Exception:
+                continue
+
+            urls_by_service_name[service_name].append(url)
+
+        for service_name, service_urls in urls_by_service_name.items():
+            service = self.services[service_name]
+            try:
+                self.print(
+                    f"[{service_name}]: Requesting data for {len(service_urls)} URLs..."
+                )
+                videos_data = service.request_many(service_urls)
+            except Exception as e:
+                self.print(f"[{service_name}]: Request error: {e}", "err")
+                continue
+
+            for url, video_data in videos_data.items():
+                cache_key = self.generate_cache_key(service_name, url)
+                self.prefetched[cache_key] = video_data
+
+    def close(self):
+        """Release any resources held by the fetcher's services (eg. open HTTP
+        sessions), by calling the `close` method of each service that defines
+        one. Call this once the fetcher is no longer being used.
+        """
+        for service in self.services.values():
+            if hasattr(service, "close"):
+                service.close()
+
     def set_cache(self, cache):
         """Set the fetcher to use a cache object. Fetched video data will be
         stored in the cache.
@@ -119,9 +189,31 @@ class Fetcher:
         us to cache successful responses from a given service for a given URL.
         (It would be nice if we could use tuple keys, but JSON doesn't support
         them).
+
+        YouTube URLs are normalized first, so that different forms of the same
+        URL share a cache key.
         """
+        if is_youtube_url(url):
+            try:
+                url = normalize_youtube_url(url)
+            except KeyError:
+                # No video id in the URL; the request will fail anyway.
+                pass
+
         return f"{service_name}-{url}"
 
+    def is_cached(self, service, cache_key: str) -> bool:
+        """Return True if the cache contains video data for the given cache key
+        that hasn't expired. Video data expires after the service's
+        `cache_max_age`, if it defines one.
+        """
+        if self.cache is None:
+            return False
+
+        max_age = getattr(service, "cache_max_age", None)
+
+        return self.cache.has(cache_key, max_age)
+
     def save_to_cache(self, video_data, cache_key, url):
         # If using a cache, and if the response object is JSON-serializable,
         # cache the response object so we don't need to retrieve it again.
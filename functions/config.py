@@ -1,11 +1,15 @@
 """Functions for managing application configuration."""
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def load_config_json(config_file_path_str: str) -> dict:
-    """Load the given JSON file and return the resulting object."""
+    """Load the given JSON file and return the resulting object. Each file is
+    only loaded once; later calls return the same object, so it shouldn't be
+    modified."""
     config_file_path = Path(config_file_path_str)
 
     with config_file_path.open() as config_file:
@@ -1,49 +1,43 @@
 """General functions for dealing with awkward dates and durations."""
 
 import re
+from collections import Counter
 from datetime import datetime
 from pytz import timezone
-from functions.general import get_freq_table
 from classes.voting import Ballot
 
+# Pattern for the ISO 8601 durations returned by the YouTube Data API, eg.
+# "PT1H2M3S". Every component is optional. Days are included, as YouTube uses
+# them for very long videos and livestreams (eg. "P1DT2H", or "P0D").
+ISO8601_DURATION_PATTERN = re.compile(
+    r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?"
+)
+
 
 def parse_votes_csv_timestamp(timestamp: str) -> datetime:
     """Parse the timestamp from the votes CSV file into a datetime object.
 
     The timestamp is in the format M/D/Y h:m:s, where - annoyingly - M, D, and h
     can have either 1 or 2 digits. Python's `strptime` parser isn't able to
-    handle that, so we have to preprocess the date a little first.
+    handle that, so we split the timestamp into its components ourselves.
     """
 
     timestamp = timestamp.strip()
-    pattern = r"^(\d+)/(\d+)/(\d+) (\d+):(\d+):(\d+)$"
-    match = re.match(pattern, timestamp)
+
     try:
-        date_components = match.groups()
-    except AttributeError:
-        raise ValueError(
-            f'Cannot parse votes CSV timestamp "{timestamp}"; invalid format'
-        )
+        date_part, time_part = timestamp.split(" ")
+        month, day, year = date_part.split("/")
+        hour, minute, second = time_part.split(":")
 
-    if len(date_components) != 6:
+        date_components = (year, month, day, hour, minute, second)
+        if not all(component.isdecimal() for component in date_components):
+            raise ValueError()
+
+        return datetime(*(int(component) for component in date_components))
+    except ValueError:
         raise ValueError(
             f'Cannot parse votes CSV timestamp "{timestamp}"; invalid format'
-        )
-
-    month, day, year, hour, minute, second = date_components
-    month = month.zfill(2)
-    day = day.zfill(2)
-    year = year.zfill(4)
-    hour = hour.zfill(2)
-    minute = minute.zfill(2)
-    second = second.zfill(2)
-
-    processed_timestamp = f"{month}/{day}/{year} {hour}:{minute}:{second}"
-
-    timestamp_format = "%m/%d/%Y %H:%M:%S"
-    dt = datetime.strptime(processed_timestamp, timestamp_format)
-
-    return dt.replace(tzinfo=None)
+        ) from None
 
 
 def format_votes_csv_timestamp(dt: datetime) -> str:
@@ -65,24 +59,17 @@ def convert_iso8601_duration_to_seconds(iso8601_duration: str) -> int:
 
     Note: Apparently the isodate package can perform this conversion if needed.
     """
-    if iso8601_duration.startswith("PT"):
-        iso8601_duration = iso8601_duration[2:]
-
-    total_seconds, hours, minutes, seconds = 0, 0, 0, 0
-
-    if "H" in iso8601_duration:
-        hours_part, iso8601_duration = iso8601_duration.split("H")
-        hours = int(hours_part)
-
-    if "M" in iso8601_duration:
-        minutes_part, iso8601_duration = iso8601_duration.split("M")
-        minutes = int(minutes_part)
+    match = ISO8601_DURATION_PATTERN.fullmatch(iso8601_duration)
+    if match is None:
+        raise ValueError(
+            f'Cannot convert ISO 8601 duration "{iso8601_duration}"; invalid format'
+        )
 
-    if "S" in iso8601_duration:
-        seconds_part = iso8601_duration.replace("S", "")
-        seconds = int(seconds_part)
+    days, hours, minutes, seconds = (
+        int(component) if component else 0 for component in match.groups()
+    )
 
-    total_seconds = hours * 3600 + minutes * 60 + seconds
+    total_seconds = days * 86400 + hours * 3600 + minutes * 60 + seconds
 
     return total_seconds
 
@@ -143,18 +130,11 @@ def guess_voting_month_year(ballots: list[Ballot]) -> tuple[int, int, bool]:
 
     Returns a tuple of 3 values: month, year, and is_unanimous, which is set to
     True if all ballots agreed on the same month and year."""
-    voting_month_years = [
+    voting_month_year_counts = Counter(
         (ballot.timestamp.month, ballot.timestamp.year) for ballot in ballots
-    ]
-    voting_month_year_counts = get_freq_table(voting_month_years)
-
-    sorted_voting_month_years = sorted(
-        voting_month_year_counts,
-        key=lambda my: voting_month_year_counts[my],
-        reverse=True,
     )
 
-    most_common_month_year = sorted_voting_month_years[0]
-    is_unanimous = len(sorted_voting_month_years) == 1
+    [(most_common_month_year, _)] = voting_month_year_counts.most_common(1)
+    is_unanimous = len(voting_month_year_counts) == 1
 
     return (*most_common_month_year, is_unanimous)
@@ -1,5 +1,6 @@
 """General-use functions."""
 
+from collections import Counter
 from pathlib import Path
 
 
@@ -20,11 +21,4 @@ def get_freq_table(values: list) -> dict:
     """Given a list of values, return a dictionary mapping each value to the
     number of times it occurs in the list."""
 
-    freqs = {}
-
-    for value in values:
-        if value not in freqs:
-            freqs[value] = 0
-        freqs[value] += 1
-
-    return freqs
+    return dict(Counter(values))
@@ -1,30 +1,65 @@
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from threading import Semaphore
 from functions.general import get_freq_table
 from functions.services import get_fetcher
 from functions.messages import suc, inf, err
+from functions.url import get_url_host
 from classes.fetcher import Fetcher
 
 # URL of Flynn's master archive of all Top 10 Pony Videos results, referenced by
 # some of the output spreadsheets.
 MASTER_ARCHIVE_URL = "https://docs.google.com/spreadsheets/d/1rEofPkliKppvttd8pEX8H6DtSljlfmQLdFR-SlyyX7E/edit"
 
+# Maximum number of video data fetches that can be in progress at once, in total
+# and for any single host. The per-host limit helps avoid tripping the rate
+# limits of individual sites.
+MAX_CONCURRENT_FETCHES = 8
+MAX_CONCURRENT_FETCHES_PER_HOST = 4
+
 
 def fetch_videos_data(urls: list[str]) -> dict[str, dict]:
     """Given a list of video URLs, return a dictionary mapping each URL to its
-    data."""
+    data. The URLs are fetched concurrently, but the dictionary preserves the
+    order of the given list."""
     fetcher = get_fetcher()
 
-    videos_data = {}
+    # Create all of the per-host semaphores up front, so the worker threads
+    # only ever read from the dictionary. Malformed URLs all share the "" host;
+    # their fetches will fail and be reported like any other failed fetch.
+    host_semaphores = {}
     for url in urls:
-        video_data = None
-        try:
-            video_data = fetcher.fetch(url)
-        except Exception as e:
-            err(f"WARNING: Could not fetch data for URL {url}")
-
-        videos_data[url] = video_data
+        host = get_url_host(url)
+        if host not in host_semaphores:
+            host_semaphores[host] = Semaphore(MAX_CONCURRENT_FETCHES_PER_HOST)
+
+    def fetch_video_data(url: str) -> dict:
+        with host_semaphores[get_url_host(url)]:
+            try:
+                return fetcher.fetch(url)
+            except Exception as e:
+                err(f"WARNING: Could not fetch data for URL {url}")
+                return None
+
+    fetched_videos_data = {}
+    try:
+        # Request as much of the data as possible in bulk first; the individual
+        # fetches below then only need to make requests for whatever is left
+        # over.
+        fetcher.prefetch(urls)
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+            futures = {executor.submit(fetch_video_data, url): url for url in urls}
+            for future in as_completed(futures):
+                fetched_videos_data[futures[future]] = future.result()
+    finally:
+        # The worker threads have all finished by now, so the resources the
+        # services created for them can be released.
+        fetcher.close()
+
+    videos_data = {url: fetched_videos_data[url] for url in urls}
 
     return videos_data
 
@@ -4,7 +4,7 @@ from functions.config import load_config_json
 from functions.messages import suc, inf, err
 from classes.fetcher import Fetcher
 from classes.fetch_services import YouTubeFetchService, YtDlpFetchService
-from classes.caching import FileCache
+from classes.caching import FileCache, SqliteCache
 from classes.printers import ConsolePrinter
 from dotenv import load_dotenv
 
@@ -42,7 +42,10 @@ def get_fetcher(
     cache_file = config["paths"]["cache"]
     if cache_file is not None:
         inf(f"  * Fetched video data will be cached in {cache_file}.")
-        fetcher.set_cache(FileCache(cache_file))
+        if cache_file.endswith(".sqlite"):
+            fetcher.set_cache(SqliteCache(cache_file))
+        else:
+            fetcher.set_cache(FileCache(cache_file))
 
     # Configure fetch services. Currently the YouTube Data API and yt-dlp are
     # supported.
@@ -1,6 +1,7 @@
 """Functions for calculating video rankings based on number of votes."""
 
 import csv
+from collections import Counter
 
 urls_file = "outputs/shifted_cells.csv"
 
@@ -21,7 +22,7 @@ def analyze_and_write_titles_to_csv(input_file: str, output_file: str):
     """
     # TODO: Separate the CSV file operations and processing logic
     total_rows = 0
-    title_counts = {}
+    title_counts = Counter()
     title_urls = {}
 
     with open(input_file, "r", encoding="utf-8") as titles_csv:
@@ -50,7 +51,7 @@ def analyze_and_write_titles_to_csv(input_file: str, output_file: str):
                     title = title.strip()
                     url = url.strip()
                     if title:
-                        title_counts[title] = title_counts.get(title, 0) + 1
+                        title_counts[title] += 1
                         title_urls[title] = url
 
     title_percentage = {  # calculates percentage
@@ -17,6 +17,16 @@ def is_youtube_url(url: str) -> bool:
     return url_components.netloc in youtube_domains
 
 
+def get_url_host(url: str) -> str:
+    """Return the host (network location) part of the given URL, or an empty
+    string if the URL is too malformed to be parsed."""
+
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ""
+
+
 def normalize_youtube_url(url: str):
     """Given a YouTube URL which may contain various combinations and orderings
     of query parameters, return a "normalized" URL which contains the minimal
@@ -18,38 +18,27 @@ from functions.post_processing import (
 )
 from functions.messages import suc, inf, err
 
+# Header line required in the input CSV (ie. the output of the Top 10
+# calculator).
+CALC_CSV_HEADER = ["Title", "Percentage", "Total Votes", "URL"]
 
-def browse_input_file():
-    """Handler for the "Choose Input CSV" button. Opens a file dialog and sets the
-    global variable `input_file_var` to the selected file."""
-    file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
-    input_file_var.set(file_path)
 
+def run(input_csv: Path, output_dir: str = "outputs") -> tuple[str, str, str]:
+    """Run post-processing on the given Top 10 calculator output CSV, and write
+    the results to the output directory. Returns the paths of the archive CSV,
+    sharable CSV, and showcase description files that were written.
 
-def handle_post_processing():
-    """Handler for the "Run post-processing" button."""
-    input_file_str = input_file_var.get()
-    if input_file_str.strip() == "":
-        tk.messagebox.showinfo("Error", "Please select a CSV file to process.")
-        return
-
-    input_file_path = Path(input_file_str)
-    output_dir = "outputs"
+    Raises a ValueError if the input CSV doesn't have the expected header.
+    """
     output_file_prefix = "post-processed-"
 
     calc_records = []
-    with input_file_path.open("r", newline="", encoding="utf-8") as file:
+    with Path(input_csv).open("r", newline="", encoding="utf-8") as file:
         reader = csv.DictReader(file)
-        required_header = ["Title", "Percentage", "Total Votes", "URL"]
-        if reader.fieldnames != required_header:
-            err(
-                f'Selected CSV file "{input_file_str}" has an invalid header: {",".join(reader.fieldnames)}'
+        if reader.fieldnames != CALC_CSV_HEADER:
+            raise ValueError(
+                f'CSV file "{input_csv}" has an invalid header. The file must have the following header line:\n\n{",".join(CALC_CSV_HEADER)}'
             )
-            tk.messagebox.showinfo(
-                "Error",
-                f"The selected CSV file is invalid. The file must have the following header line:\n\n{','.join(required_header)}",
-            )
-            return
 
         calc_records = [record for record in reader]
 
@@ -79,60 +68,98 @@ def handle_post_processing():
     suc(f"Wrote showcase description to {desc_file}.")
     suc("Finished.")
 
+    return archive_file, sharable_file, desc_file
+
+
+def browse_input_file(input_file_var: tk.StringVar):
+    """Handler for the "Choose Input CSV" button. Opens a file dialog and sets
+    `input_file_var` to the selected file."""
+    file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
+    input_file_var.set(file_path)
+
+
+def handle_post_processing(input_file_var: tk.StringVar):
+    """Handler for the "Run post-processing" button."""
+    input_file_str = input_file_var.get()
+    if input_file_str.strip() == "":
+        tk.messagebox.showinfo("Error", "Please select a CSV file to process.")
+        return
+
+    try:
+        output_files = run(Path(input_file_str))
+    except ValueError as e:
+        err(str(e))
+        tk.messagebox.showinfo("Error", str(e))
+        return
+
+    output_files_str = "\n".join(output_files)
     tk.messagebox.showinfo(
         "Success",
-        f"Post-processing complete. The following output files have been created:\n\n{archive_file}\n{sharable_file}\n{desc_file}",
+        f"Post-processing complete. The following output files have been created:\n\n{output_files_str}",
     )
 
 
-# Create application window
-root = tk.Tk()
-root.title("Top 10 Pony Videos: Post-processing")
-root.geometry(f"800x400")
+def _main_gui():
+    """Create the application window and run the GUI."""
 
-# Create main frame
-main_frame = tk.Frame(root)
-main_frame.pack(expand=True, fill="both", padx=10, pady=10)
+    # Create application window
+    root = tk.Tk()
+    root.title("Top 10 Pony Videos: Post-processing")
+    root.geometry(f"800x400")
 
-# Create banner image
-banner_image = ImageTk.PhotoImage(Image.open("images/post-processing.png"))
-banner_label = tk.Label(main_frame, image=banner_image)
-banner_label.pack()
+    # Create main frame
+    main_frame = tk.Frame(root)
+    main_frame.pack(expand=True, fill="both", padx=10, pady=10)
 
-# Create title
-title_font = Font(size=16)
-title_label = tk.Label(main_frame, font=title_font, text="Post-processing")
-title_label.pack(pady=8)
+    # Create banner image
+    banner_image = ImageTk.PhotoImage(Image.open("images/post-processing.png"))
+    banner_label = tk.Label(main_frame, image=banner_image)
+    banner_label.pack()
 
-# Create "Choose Input CSV..." control
-input_file_frame = tk.Frame(main_frame)
-input_file_label = tk.Label(input_file_frame, text="Input CSV file:")
+    # Create title
+    title_font = Font(size=16)
+    title_label = tk.Label(main_frame, font=title_font, text="Post-processing")
+    title_label.pack(pady=8)
 
-default_input_file = "outputs/calculated_top_10.csv"
-input_file_var = tk.StringVar()
-input_file_var.set(default_input_file)
-input_file_entry = ttk.Entry(input_file_frame, width=40, textvariable=input_file_var)
+    # Create "Choose Input CSV..." control
+    input_file_frame = tk.Frame(main_frame)
+    input_file_label = tk.Label(input_file_frame, text="Input CSV file:")
 
-browse_button = ttk.Button(
-    input_file_frame, text="📁 Choose Input CSV...", command=browse_input_file
-)
+    default_input_file = "outputs/calculated_top_10.csv"
+    input_file_var = tk.StringVar()
+    input_file_var.set(default_input_file)
+    input_file_entry = ttk.Entry(
+        input_file_frame, width=40, textvariable=input_file_var
+    )
+
+    browse_button = ttk.Button(
+        input_file_frame,
+        text="📁 Choose Input CSV...",
+        command=lambda: browse_input_file(input_file_var),
+    )
 
-input_file_label.grid(column=0, row=0, padx=5, pady=5)
-input_file_entry.grid(column=1, row=0, padx=5, pady=5)
-browse_button.grid(column=2, row=0, padx=5, pady=5)
+    input_file_label.grid(column=0, row=0, padx=5, pady=5)
+    input_file_entry.grid(column=1, row=0, padx=5, pady=5)
+    browse_button.grid(column=2, row=0, padx=5, pady=5)
 
-input_file_frame.pack()
+    input_file_frame.pack()
 
-# Create buttons bar
-buttons_frame = tk.Frame(main_frame)
-buttons_frame.pack()
+    # Create buttons bar
+    buttons_frame = tk.Frame(main_frame)
+    buttons_frame.pack()
 
-run_button = ttk.Button(
-    buttons_frame, text="🏁 Run Post-processing", command=handle_post_processing
-)
-run_button.grid(column=0, row=0, padx=5, pady=5)
+    run_button = ttk.Button(
+        buttons_frame,
+        text="🏁 Run Post-processing",
+        command=lambda: handle_post_processing(input_file_var),
+    )
+    run_button.grid(column=0, row=0, padx=5, pady=5)
+
+    quit_button = ttk.Button(buttons_frame, text="Quit", command=root.destroy)
+    quit_button.grid(column=1, row=0, padx=5, pady=5)
+
+    root.mainloop()
 
-quit_button = ttk.Button(buttons_frame, text="Quit", command=root.destroy)
-quit_button.grid(column=1, row=0, padx=5, pady=5)
 
-root.mainloop()
+if __name__ == "__main__":
+    _main_gui()
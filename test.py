@@ -1,4 +1,5 @@
 import unittest
+from tests.classes.caching import TestCaching
 from tests.classes.fetcher import TestFetcher
 from tests.classes.fetch_services import TestFetchServices
 from tests.functions.voting import TestFunctionsVoting
@@ -0,0 +1,67 @@
+import sqlite3
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from classes.caching import SqliteCache
+
+
+class TestCaching(TestCase):
+    def test_SqliteCache(self):
+        with TemporaryDirectory() as temp_dir:
+            cache_file = str(Path(temp_dir) / "cache.sqlite")
+            cache = SqliteCache(cache_file)
+
+            self.assertFalse(cache.has("YouTube-https://example.com"))
+            with self.assertRaises(KeyError):
+                cache.get("YouTube-https://example.com")
+
+            video_data = {"title": "Example Video", "duration": 90}
+            cache.set("YouTube-https://example.com", video_data)
+            self.assertTrue(cache.has("YouTube-https://example.com"))
+            self.assertEqual(video_data, cache.get("YouTube-https://example.com"))
+
+            # Values which can't be stored as JSON shouldn't be cached
+            with self.assertRaises(TypeError):
+                cache.set("YouTube-https://example.com/2", {"date": time})
+            self.assertFalse(cache.has("YouTube-https://example.com/2"))
+
+            # Items should persist between cache instances
+            cache.connection.close()
+            cache = SqliteCache(cache_file)
+            self.assertEqual(video_data, cache.get("YouTube-https://example.com"))
+
+            # Items older than the max age should be ignored
+            an_hour_ago = int(time.time()) - 60 * 60
+            with cache.connection:
+                cache.connection.execute(
+                    "UPDATE cache SET stored_at = ?", (an_hour_ago,)
+                )
+            self.assertTrue(cache.has("YouTube-https://example.com"))
+            self.assertTrue(cache.has("YouTube-https://example.com", 2 * 60 * 60))
+            self.assertFalse(cache.has("YouTube-https://example.com", 30 * 60))
+            cache.connection.close()
+
+            # A locked database should be left alone, rather than being
+            # mistaken for an invalid one
+            other_connection = sqlite3.connect(cache_file)
+            other_connection.execute("BEGIN EXCLUSIVE")
+            with self.assertRaises(sqlite3.OperationalError):
+                SqliteCache(cache_file)
+            other_connection.rollback()
+            other_connection.close()
+
+            cache = SqliteCache(cache_file)
+            self.assertTrue(cache.has("YouTube-https://example.com"))
+            cache.connection.close()
+
+            # A database that can't be opened should raise the original error
+            missing_dir_cache_file = str(Path(temp_dir) / "missing" / "cache.sqlite")
+            with self.assertRaises(sqlite3.OperationalError):
+                SqliteCache(missing_dir_cache_file)
+
+            # An invalid database file should be replaced with a new one
+            Path(cache_file).write_text("Not a database")
+            cache = SqliteCache(cache_file)
+            self.assertFalse(cache.has("YouTube-https://example.com"))
+            cache.connection.close()
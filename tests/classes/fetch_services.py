@@ -1,5 +1,7 @@
+import threading
 from unittest import TestCase
-from classes.fetch_services import YouTubeFetchService
+from datetime import datetime, timezone
+from classes.fetch_services import YouTubeFetchService, YtDlpFetchService
 
 
 class TestFetchServices(TestCase):
@@ -40,3 +42,153 @@ class TestFetchServices(TestCase):
         url = "https://pony.tube/w/2FCj5YvmdHy8AC2hkEbc9i"
         self.assertFalse(service.can_fetch(url))
         self.assertEqual(None, service.extract_video_id(url))
+
+    def test_YouTubeFetchService_request_many(self):
+        class MockVideosListRequest:
+            def __init__(self, video_ids):
+                self.video_ids = video_ids
+
+            def execute(self):
+                # Pretend that every video id starting with "x" is unavailable.
+                return {
+                    "items": [
+                        {
+                            "id": video_id,
+                            "snippet": {
+                                "title": f"Video {video_id}",
+                                "channelTitle": "Example Uploader",
+                                "publishedAt": "2024-04-01T00:00:00Z",
+                            },
+                            "contentDetails": {
+                                # Pretend that video id "v1" has a malformed
+                                # duration.
+                                "duration": (
+                                    "1 minute" if video_id == "v1" else "PT1M30S"
+                                )
+                            },
+                        }
+                        for video_id in self.video_ids
+                        if not video_id.startswith("x")
+                    ]
+                }
+
+        class MockBatchHttpRequest:
+            def __init__(self, callback):
+                self.callback = callback
+                self.requests = []
+
+            def add(self, request, request_id):
+                self.requests.append((request_id, request))
+
+            def execute(self):
+                for request_id, request in self.requests:
+                    self.callback(request_id, request.execute(), None)
+
+        class MockYouTubeService:
+            def __init__(self):
+                self.requested_video_ids = []
+                self.batches = []
+
+            def new_batch_http_request(self, callback):
+                batch = MockBatchHttpRequest(callback)
+                self.batches.append(batch)
+                return batch
+
+            def videos(self):
+                return self
+
+            def list(self, part, id):
+                video_ids = id.split(",")
+                self.requested_video_ids.append(video_ids)
+                return MockVideosListRequest(video_ids)
+
+        service = YouTubeFetchService("API_KEY", False)
+        mock_yt_service = MockYouTubeService()
+        service.thread_local.yt_service = mock_yt_service
+
+        urls = [f"https://www.youtube.com/watch?v=v{i}" for i in range(120)]
+        urls.append("https://youtu.be/v0")
+        urls.append("https://youtu.be/x0")
+        urls.append("https://www.youtube.com/watch?list=x")
+
+        videos_data = service.request_many(urls)
+
+        # 121 unique video ids should take 3 requests, sent as a single batch
+        self.assertEqual(1, len(mock_yt_service.batches))
+        self.assertEqual(
+            [50, 50, 21], [len(ids) for ids in mock_yt_service.requested_video_ids]
+        )
+        # Unavailable videos, malformed URLs, and malformed response items
+        # should only affect their own URLs
+        self.assertEqual(120, len(videos_data))
+        self.assertNotIn("https://youtu.be/x0", videos_data)
+        self.assertNotIn("https://www.youtube.com/watch?list=x", videos_data)
+        self.assertNotIn("https://www.youtube.com/watch?v=v1", videos_data)
+        self.assertIn("https://www.youtube.com/watch?v=v2", videos_data)
+
+        video_data = videos_data["https://youtu.be/v0"]
+        self.assertEqual("Video v0", video_data["title"])
+        self.assertEqual("Example Uploader", video_data["uploader"])
+        self.assertEqual("2024-04-01T00:00:00Z", video_data["upload_date"])
+        self.assertEqual(90, video_data["duration"])
+
+    def test_YouTubeFetchService_parse(self):
+        service = YouTubeFetchService("API_KEY", False)
+
+        video_data = service.parse(
+            {
+                "title": "Example Video",
+                "uploader": "Example Uploader",
+                "upload_date": "2024-04-01T12:34:56Z",
+                "duration": 90,
+            }
+        )
+
+        self.assertEqual("Example Video", video_data["title"])
+        self.assertEqual("Example Uploader", video_data["uploader"])
+        self.assertEqual(
+            datetime(2024, 4, 1, 12, 34, 56, tzinfo=timezone.utc),
+            video_data["upload_date"],
+        )
+        self.assertEqual(timezone.utc, video_data["upload_date"].tzinfo)
+        self.assertEqual(90, video_data["duration"])
+
+    def test_YtDlpFetchService_can_fetch(self):
+        service = YtDlpFetchService(["pony.tube", "tiktok.com", "x.com"])
+
+        self.assertTrue(service.can_fetch("https://pony.tube/w/2FCj5YvmdHy8AC2hkEbc9i"))
+        self.assertTrue(service.can_fetch("https://www.tiktok.com/@user/video/1"))
+        self.assertTrue(service.can_fetch("https://x.com/user/status/1"))
+        self.assertTrue(service.can_fetch("https://X.com:443/user/status/1"))
+
+        # Accepted domains appearing elsewhere in the URL shouldn't count
+        self.assertFalse(service.can_fetch("https://box.com/x.com"))
+        self.assertFalse(service.can_fetch("https://example.com/?next=pony.tube"))
+        self.assertFalse(
+            service.can_fetch("https://www.youtube.com/watch?v=9RT4lfvVFhA")
+        )
+        self.assertFalse(service.can_fetch("not a url"))
+        self.assertFalse(service.can_fetch("https://[oops"))
+
+    def test_YtDlpFetchService_close(self):
+        service = YtDlpFetchService(["pony.tube"])
+
+        # Each thread should get its own YoutubeDL object, reused across calls
+        ydls = [service.ydl]
+        self.assertIs(ydls[0], service.ydl)
+
+        thread = threading.Thread(target=lambda: ydls.append(service.ydl))
+        thread.start()
+        thread.join()
+        self.assertIsNot(ydls[0], ydls[1])
+
+        # Closing the service should close every thread's object, and any
+        # later use should get a new one
+        closed_ydls = []
+        for ydl in ydls:
+            ydl.close = lambda ydl=ydl: closed_ydls.append(ydl)
+
+        service.close()
+        self.assertEqual(ydls, closed_ydls)
+        self.assertNotIn(service.ydl, ydls)
+        service.close()
@@ -92,3 +92,102 @@ class TestFetcher(TestCase):
         fetcher.add_service("success_mock", service)
         video_data = fetcher.fetch("https://example.com")
         self.assertEqual("Example Video", video_data["title"])
+
+    def test_prefetch(self):
+        class BatchMockFetchService:
+            def __init__(self):
+                self.requested_urls = []
+
+            def can_fetch(self, url):
+                return True
+
+            def request(self, url):
+                self.requested_urls.append(url)
+                return {"title": f"Requested {url}"}
+
+            def request_many(self, urls):
+                self.requested_urls.extend(urls)
+                # Pretend that one of the videos is unavailable
+                return {
+                    url: {"title": f"Prefetched {url}"}
+                    for url in urls
+                    if url != "https://example.com/3"
+                }
+
+            def parse(self, response):
+                return {"title": response["title"]}
+
+        fetcher = Fetcher()
+        service = BatchMockFetchService()
+        fetcher.add_service("batch_mock", service)
+
+        urls = [f"https://example.com/{i}" for i in range(1, 5)]
+
+        # A malformed URL shouldn't stop the other URLs being prefetched
+        fetcher.prefetch(["https://[oops"] + urls)
+        self.assertEqual(urls, service.requested_urls)
+
+        # Prefetched URLs shouldn't be requested again, but any that couldn't
+        # be prefetched should be requested individually.
+        service.requested_urls = []
+        videos_data = [fetcher.fetch(url) for url in urls]
+        self.assertEqual(["https://example.com/3"], service.requested_urls)
+        self.assertEqual("Prefetched https://example.com/1", videos_data[0]["title"])
+        self.assertEqual("Requested https://example.com/3", videos_data[2]["title"])
+
+    def test_generate_cache_key(self):
+        fetcher = Fetcher()
+
+        # Different forms of the same YouTube URL should share a cache key
+        self.assertEqual(
+            "YouTube-https://www.youtube.com/watch?v=9RT4lfvVFhA",
+            fetcher.generate_cache_key("YouTube", "https://youtu.be/9RT4lfvVFhA"),
+        )
+        self.assertEqual(
+            "YouTube-https://www.youtube.com/watch?v=9RT4lfvVFhA",
+            fetcher.generate_cache_key(
+                "YouTube", "https://www.youtube.com/watch?app=desktop&v=9RT4lfvVFhA"
+            ),
+        )
+
+        self.assertEqual(
+            "yt-dlp-https://pony.tube/w/2FCj5YvmdHy8AC2hkEbc9i",
+            fetcher.generate_cache_key(
+                "yt-dlp", "https://pony.tube/w/2FCj5YvmdHy8AC2hkEbc9i"
+            ),
+        )
+
+    def test_close(self):
+        class ClosableMockFetchService:
+            def __init__(self):
+                self.closed = False
+
+            def can_fetch(self, url):
+                return True
+
+            def request(self, url):
+                return {"title": "Example Video"}
+
+            def parse(self, response):
+                return {"title": response["title"]}
+
+            def close(self):
+                self.closed = True
+
+        class UnclosableMockFetchService:
+            def can_fetch(self, url):
+                return True
+
+            def request(self, url):
+                return {"title": "Example Video"}
+
+            def parse(self, response):
+                return {"title": response["title"]}
+
+        fetcher = Fetcher()
+        service = ClosableMockFetchService()
+        fetcher.add_service("closable_mock", service)
+        fetcher.add_service("unclosable_mock", UnclosableMockFetchService())
+
+        fetcher.close()
+        self.assertTrue(service.closed)
@@ -4,6 +4,7 @@ from datetime import datetime
 from functions.date import (
     parse_votes_csv_timestamp,
     format_votes_csv_timestamp,
+    convert_iso8601_duration_to_seconds,
     get_preceding_month_date,
     get_month_year_bounds,
     is_date_between,
@@ -34,6 +35,14 @@ class TestFunctionsDate(TestCase):
         with self.assertRaises(ValueError):
             dt = parse_votes_csv_timestamp(timestamp)
 
+        timestamp = "4/1/2024 9:00"
+        with self.assertRaises(ValueError):
+            dt = parse_votes_csv_timestamp(timestamp)
+
+        timestamp = "13/1/2024 9:00:00"
+        with self.assertRaises(ValueError):
+            dt = parse_votes_csv_timestamp(timestamp)
+
     def test_format_votes_csv_timestamp(self):
         dt = datetime(2024, 4, 1, 9, 0, 0)
         timestamp = format_votes_csv_timestamp(dt)
@@ -43,6 +52,17 @@ class TestFunctionsDate(TestCase):
         timestamp = format_votes_csv_timestamp(dt)
         self.assertEqual("12/25/2024 0:00:00", timestamp)
 
+    def test_convert_iso8601_duration_to_seconds(self):
+        self.assertEqual(3, convert_iso8601_duration_to_seconds("PT3S"))
+        self.assertEqual(90, convert_iso8601_duration_to_seconds("PT1M30S"))
+        self.assertEqual(3600, convert_iso8601_duration_to_seconds("PT1H"))
+        self.assertEqual(3723, convert_iso8601_duration_to_seconds("PT1H2M3S"))
+        self.assertEqual(93600, convert_iso8601_duration_to_seconds("P1DT2H"))
+        self.assertEqual(0, convert_iso8601_duration_to_seconds("P0D"))
+
+        with self.assertRaises(ValueError):
+            convert_iso8601_duration_to_seconds("1 minute")
+
     def test_get_preceding_month_date(self):
         date = datetime(2024, 2, 14)
         self.assertEqual(datetime(2024, 1, 1), get_preceding_month_date(date))
@@ -1,6 +1,8 @@
 from unittest import TestCase
+from unittest.mock import patch
 from datetime import datetime
 from functions.post_processing import (
+    fetch_videos_data,
     create_post_processed_records,
     generate_archive_records,
     generate_sharable_records,
@@ -9,6 +11,50 @@ from functions.post_processing import (
 
 
 class TestFunctionsPostProcessing(TestCase):
+    def test_fetch_videos_data(self):
+        class MockFetcher:
+            def __init__(self):
+                self.closed = False
+
+            def prefetch(self, urls):
+                pass
+
+            def fetch(self, url):
+                if url.endswith("/fail"):
+                    raise Exception("Fetch failed")
+                return {"title": f"Video at {url}"}
+
+            def close(self):
+                self.closed = True
+
+        urls = [
+            "https://example.com/3",
+            "https://[oops/watch",
+            "https://example.com/fail",
+            "https://example.org/1",
+            "https://example.com/2",
+        ]
+
+        fetcher = MockFetcher()
+        with patch("functions.post_processing.get_fetcher", return_value=fetcher):
+            videos_data = fetch_videos_data(urls)
+
+        # Results should be in the same order as the given URLs, and failed
+        # fetches (including malformed URLs) shouldn't affect the others
+        self.assertEqual(urls, list(videos_data))
+        self.assertEqual(
+            "Video at https://example.com/3", videos_data[urls[0]]["title"]
+        )
+        self.assertEqual("Video at https://[oops/watch", videos_data[urls[1]]["title"])
+        self.assertIsNone(videos_data["https://example.com/fail"])
+        self.assertEqual(
+            "Video at https://example.org/1", videos_data[urls[3]]["title"]
+        )
+        self.assertEqual(
+            "Video at https://example.com/2", videos_data[urls[4]]["title"]
+        )
+        self.assertTrue(fetcher.closed)
+
     def test_create_post_processed_records(self):
         # 4 video data records, for which two are tied at 2nd place
         calc_records = [
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from functions.url import is_youtube_url, normalize_youtube_url
+from functions.url import is_youtube_url, get_url_host, normalize_youtube_url
 
 
 class TestFunctionsUrl(TestCase):
@@ -12,6 +12,17 @@ class TestFunctionsUrl(TestCase):
         self.assertFalse(is_youtube_url("https://www.bilibili.com/video/BV1HC411H7Po/"))
         self.assertFalse(is_youtube_url("https://pony.tube/w/bYSyWpjg6r6zo68o1imK5t"))
 
+    def test_get_url_host(self):
+        self.assertEqual(
+            "www.youtube.com",
+            get_url_host("https://www.youtube.com/watch?v=9RT4lfvVFhA"),
+        )
+        self.assertEqual(
+            "pony.tube", get_url_host("https://pony.tube/w/bYSyWpjg6r6zo68o1imK5t")
+        )
+        self.assertEqual("", get_url_host("not a url"))
+        self.assertEqual("", get_url_host("https://[oops/watch"))
+
     def test_normalize_youtube_url(self):
         # These should all normalize to the same YouTube URL
         normalized_url = "https://www.youtube.com/watch?v=Q8k4UTf8jiI"
@@ -1,6 +1,7 @@
 """Top 10 Pony Video Squeezer 3000 (vote processing) application."""
 
 import csv, os, shutil, sys
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 import tkinter as tk
@@ -91,7 +92,7 @@ def run_checks():
     # Load all ballots from the CSV file.
     inf(f'Loading all votes from CSV file "{selected_csv_file}"...')
     ballots = load_votes_csv(selected_csv_file)
-    total_votes = sum([len(ballot.votes) for ballot in ballots])
+    total_votes = sum(len(ballot.votes) for ballot in ballots)
 
     suc(f"Loaded {len(ballots)} ballots containing a total of {total_votes} votes.")
 
@@ -154,17 +155,16 @@ def run_checks():
     # results as the votes still reference them.
     inf("Fetching data for all videos...")
     videos = fetch_video_data_for_ballots(ballots, fetcher)
+    fetcher.close()
 
     # Print out a summary of the fetch results (number of successes, failures,
     # etc.)
     suc("Data fetch complete. Result summary:")
-    videos_by_label = {}
+    videos_by_label = defaultdict(list)
     for url, video in videos.items():
         label = video.annotations.get_label()
         if label is None:
             label = "successful"
-        if label not in videos_by_label:
-            videos_by_label[label] = []
         videos_by_label[label].append(video)
 
     for label, labeled_videos in sorted(videos_by_label.items(), key=lambda i: i[0]):